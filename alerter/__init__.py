@@ -1,4 +1,5 @@
 # Extensions package
 from .apprise_alerter import Alerter
+from .outbox import NotificationOutbox
 
-__all__ = ["Alerter"]
\ No newline at end of file
+__all__ = ["Alerter", "NotificationOutbox"]
\ No newline at end of file
@@ -1,6 +1,11 @@
+import hashlib
+import threading
+
 from utils import DataPipelineLogger
 from log_collector import GBFSLogCollector, GTFSLogCollector, NextbikeLogCollector
 
+from .outbox import NotificationOutbox
+
 
 class Alerter:
     """Alerter for sending messages"""
@@ -14,6 +19,10 @@ class Alerter:
             GBFSLogCollector | GTFSLogCollector | NextbikeLogCollector
         ],
         site_name: str,
+        outbox: NotificationOutbox | None = None,
+        batch_size: int = 20,
+        max_body_length: int = 1900,
+        max_attempts: int = 5,
     ):
         """e
         Initialize Alerter instance
@@ -21,51 +30,250 @@ class Alerter:
         Args:
             config_str: Configuration string for the alerter
             log_collectors: List of log collectors to monitor
+            outbox: Outbox messages are queued in before delivery (defaults to
+                an in-memory outbox that does not survive restarts)
+            batch_size: Maximum number of queued messages read per delivery round
+            max_body_length: Maximum length of a notification body, longer
+                messages are truncated
+            max_attempts: Failed deliveries after which a message is dropped
         """
         self.name = name
         self.logger = DataPipelineLogger(name)
         self.log_collectors = log_collectors
         self.site_name = site_name
         self.apprise_obj = apprise_obj
+        self.outbox = outbox or NotificationOutbox(":memory:")
+        self.batch_size = batch_size
+        self.max_body_length = max_body_length
+        self.max_attempts = max_attempts
+        self._flush_lock = threading.Lock()
+        # Outbox key -> whether the last conclusive delivery succeeded
+        self._channel_ok = {}
+        # Called after messages were queued, e.g. to schedule a flush. Delivery
+        # is left to flush_outbox so that queueing never waits on the network
+        self.on_enqueue = None
 
         self.apprise_obj.add(config_str)
+        self.channels = self._split_channels()
+        if not self.channels:
+            self.logger.error(f"No valid notification URL in config of {name}")
 
         self.send_initial_message()
 
+    def _split_channels(self):
+        """
+        Give every notification URL its own apprise object and outbox key, so
+        each channel is acknowledged on its own and a failing URL does not
+        cause duplicate sends to the others.
+
+        Returns:
+            Dict mapping outbox keys to (apprise object, URL without secrets)
+        """
+        channels = {}
+        for server in self.apprise_obj:
+            # Same class as the injected object, e.g. apprise.Apprise
+            channel = type(self.apprise_obj)()
+            channel.add(server)
+            url_hash = hashlib.sha256(server.url().encode()).hexdigest()[:12]
+            channels[f"{self.name}/{url_hash}"] = (channel, server.url(privacy=True))
+        return channels
+
+    def _enqueue(self, message, title):
+        """Queue a message for every channel"""
+        for key in self.channels:
+            self.outbox.put(key, message, title=title)
+        if self.on_enqueue is not None:
+            self.on_enqueue()
+
     def check_errors(self):
         for log_collector in self.log_collectors:
-            errors = log_collector.get_errors()
+            errors = log_collector.get_errors(self.name)
             if errors:
                 message = (
                     f"[\n".join(errors)
                 )
-                self.apprise_obj.notify(
-                    body=message,
-                    title=f"[{self.site_name} - {log_collector.get_name()}]",
+                self._enqueue(
+                    message, title=f"[{self.site_name} - {log_collector.get_name()}]"
                 )
 
     def send_message(self, message, title=None):
         """
-        Send a message
+        Queue a message in the outbox, it is delivered by flush_outbox
 
         Args:
             message: Text message to send
+            title: Message title (optional)
+        """
+        self._enqueue(
+            message, title=title or f"[{self.site_name}] Mobility Alerter Notification"
+        )
 
-        Raises:
-            ValueError: If no channel is specified
-            Exception: If Slack API call fails
+    def flush_outbox(self):
+        """
+        Deliver queued messages of every channel in batches, oldest first
         """
+        # Skip if another thread is already flushing, it will pick up new messages
+        if not self._flush_lock.acquire(blocking=False):
+            return
+
         try:
-            self.apprise_obj.notify(
-                body=message,
-                title=title or f"[{self.site_name}] Mobility Alerter Notification",
+            for key, (channel, url) in self.channels.items():
+                self._flush_channel(key, channel, url)
+        finally:
+            self._flush_lock.release()
+
+    def _flush_channel(self, key, channel, url):
+        """
+        Deliver the queued messages of a single channel. Failed batches are
+        skipped so that later messages still go out. If nothing in the first
+        round gets through, the newest message is tried on its own to tell an
+        outage from rejected messages. Failed messages only count an attempt when
+        the channel is known to work, so an outage does not use up the attempts
+        of queued messages. If every queued message already failed on its own
+        and cannot be used as a probe, the outcome of the last probe or
+        delivery decides.
+        """
+        expired = self.outbox.expire(key)
+        if expired:
+            self.logger.warning(
+                f"Dropped {expired} message(s) to {url} that were queued for more "
+                f"than {self.outbox.max_age}s"
             )
 
-            self.logger.info("Message sent successfully")
+        after_id = 0
+        delivered = False
+        failed_ids = []
+        failed_alone = set()
+        while True:
+            queued = self.outbox.peek(key, self.batch_size, after_id)
+            if not queued:
+                break
+            after_id = queued[-1][0]
+
+            round_delivered = False
+            for title, ids, body in self._batch_messages(queued):
+                if self._notify(channel, url, title, body):
+                    self.outbox.ack(ids)
+                    self.logger.info(f"Sent {len(ids)} queued message(s) to {url}")
+                    round_delivered = True
+                    self._channel_ok[key] = True
+                else:
+                    failed_ids.extend(ids)
+                    if len(ids) == 1:
+                        failed_alone.add(ids[0])
+
+            if round_delivered:
+                delivered = True
+            elif delivered:
+                # The channel stopped accepting messages during this flush
+                break
+            else:
+                probed = self._probe(key, channel, url, failed_alone)
+                if probed is None:
+                    # Nothing left to probe with, rely on the last known state
+                    delivered = self._channel_ok.get(key, False)
+                    break
+                if not probed:
+                    # The channel is down, retry everything on the next flush
+                    self._channel_ok[key] = False
+                    break
+                delivered = True
+
+        if not failed_ids:
+            return
+        if delivered:
+            # The channel works, so these messages are rejected on their own
+            for title, body in self.outbox.fail(failed_ids, self.max_attempts):
+                self.logger.error(
+                    f"Dropped message to {url} after {self.max_attempts} failed "
+                    f"attempts: {title} {body[:200]}"
+                )
+        self.logger.warning(
+            f"Delivery to {url} failed, {self.outbox.pending(key)} "
+            f"message(s) remain queued"
+        )
+
+    def _probe(self, key, channel, url, failed_alone):
+        """
+        Try to deliver the newest queued message of a channel on its own
 
+        Args:
+            failed_alone: Ids of messages that already failed on their own
+
+        Returns:
+            True if the channel accepted the message, False if not, and None
+            if the newest message already failed on its own
+        """
+        newest = self.outbox.peek_newest(key)
+        if newest is None or newest[0] in failed_alone:
+            return None
+        message_id, title, body, _ = newest
+        if not self._notify(channel, url, title, self._truncate(body)):
+            return False
+        self.outbox.ack([message_id])
+        self._channel_ok[key] = True
+        self.logger.info(f"Sent 1 queued message(s) to {url}")
+        return True
+
+    def _notify(self, channel, url, title, body):
+        """Send one notification, returning whether it was accepted"""
+        try:
+            return bool(channel.notify(body=body, title=title))
         except Exception as e:
-            error_msg = f"Failed to send message: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.error(f"Failed to send message to {url}: {str(e)}")
+            return False
+
+    def _batch_messages(self, queued):
+        """
+        Combine queued messages into notifications. Messages that share a
+        title are joined as long as the body stays within max_body_length.
+        Messages that failed before are sent alone, so a rejected message
+        cannot hold back others.
+
+        Args:
+            queued: List of (id, title, body, attempts) tuples
+
+        Returns:
+            List of (title, ids, body) tuples in the order of first appearance
+        """
+        batches = []
+        open_batches = {}
+        for message_id, title, body, attempts in queued:
+            body = self._truncate(body)
+            batch = open_batches.get(title)
+            if (
+                batch is not None
+                and not attempts
+                and len(batch[2]) + 1 + len(body) <= self.max_body_length
+            ):
+                batch[1].append(message_id)
+                batch[2] += "\n" + body
+                continue
+
+            batch = [title, [message_id], body]
+            batches.append(batch)
+            if not attempts:
+                open_batches[title] = batch
+        return [tuple(batch) for batch in batches]
+
+    def _truncate(self, body):
+        """
+        Shorten a body to max_body_length characters. Bodies wrapped in a
+        ``` code block, like the daily summaries, are cut at a line inside
+        the block and the block is closed again, so the table still renders.
+        """
+        if len(body) <= self.max_body_length:
+            return body
+        fence = "```"
+        if body.startswith(fence) and body.endswith(fence):
+            suffix = "\n[truncated]\n" + fence
+            kept = body[: self.max_body_length - len(suffix)]
+            line_end = kept.rfind("\n")
+            if line_end > len(fence):
+                kept = kept[:line_end]
+            return kept + suffix
+        suffix = "\n[truncated]"
+        return body[: self.max_body_length - len(suffix)] + suffix
 
     def send_daily_summary(self):
         """
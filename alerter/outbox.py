@@ -0,0 +1,230 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from utils import DataPipelineLogger
+
+
+class NotificationOutbox:
+    """Persistent append-only queue of notifications backed by SQLite"""
+
+    def __init__(self, path, max_pending=10000, max_age=7 * 24 * 3600):
+        """
+        Initialize the outbox and create its table if needed
+
+        Args:
+            path: Path to the SQLite database file (":memory:" for a volatile outbox)
+            max_pending: Maximum number of queued messages per channel, the
+                oldest messages are dropped beyond that
+            max_age: Seconds after which a queued message is stale and dropped
+        """
+        self.path = path
+        self.max_pending = max_pending
+        self.max_age = max_age
+        self.logger = DataPipelineLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit mode, transactions are opened explicitly below
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        # In WAL mode with synchronous=NORMAL commits survive a process crash
+        # and fsyncs are batched at checkpoints instead of on every insert
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel TEXT NOT NULL,
+                title TEXT,
+                body TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        # Outboxes created before delivery attempts were counted
+        columns = [
+            row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")
+        ]
+        if "attempts" not in columns:
+            self._conn.execute(
+                "ALTER TABLE outbox ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_channel ON outbox (channel, id)"
+        )
+
+    def put(self, channel, body, title=None):
+        """
+        Append a message to the outbox of a channel
+
+        Args:
+            channel: Name of the channel the message is delivered to
+            body: Message body
+            title: Message title (optional)
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO outbox (channel, title, body, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (channel, title, body, time.time()),
+                )
+                dropped = self._conn.execute(
+                    "DELETE FROM outbox WHERE channel = ? AND id <= ("
+                    "SELECT id FROM outbox WHERE channel = ? "
+                    "ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (channel, channel, self.max_pending),
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if dropped:
+            self.logger.warning(
+                f"Outbox for {channel} is full, dropped {dropped} oldest message(s)"
+            )
+
+    def peek(
+        self, channel, limit, after_id=0
+    ) -> list[tuple[int, str | None, str, int]]:
+        """
+        Return up to limit of the oldest queued messages of a channel
+
+        Args:
+            channel: Name of the channel
+            limit: Maximum number of messages to return
+            after_id: Only return messages with a larger id
+
+        Returns:
+            List of (id, title, body, attempts) tuples in insertion order
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, title, body, attempts FROM outbox "
+                "WHERE channel = ? AND id > ? ORDER BY id LIMIT ?",
+                (channel, after_id, limit),
+            ).fetchall()
+
+    def peek_newest(self, channel) -> tuple[int, str | None, str, int] | None:
+        """
+        Return the most recently queued message of a channel
+
+        Args:
+            channel: Name of the channel
+
+        Returns:
+            (id, title, body, attempts) tuple, or None if nothing is queued
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, title, body, attempts FROM outbox "
+                "WHERE channel = ? ORDER BY id DESC LIMIT 1",
+                (channel,),
+            ).fetchone()
+
+    def ack(self, ids):
+        """
+        Remove delivered messages from the outbox
+
+        Args:
+            ids: Ids of the delivered messages
+        """
+        with self._lock:
+            placeholders = ",".join("?" * len(ids))
+            self._conn.execute(
+                f"DELETE FROM outbox WHERE id IN ({placeholders})", list(ids)
+            )
+
+    def fail(self, ids, max_attempts) -> list[tuple[str | None, str]]:
+        """
+        Count a failed delivery attempt for messages and drop those that
+        reached max_attempts
+
+        Args:
+            ids: Ids of the messages that could not be delivered
+            max_attempts: Number of failed attempts after which a message is
+                dropped
+
+        Returns:
+            List of (title, body) tuples of the dropped messages
+        """
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE outbox SET attempts = attempts + 1 "
+                    f"WHERE id IN ({placeholders})",
+                    list(ids),
+                )
+                dropped = self._conn.execute(
+                    "SELECT title, body FROM outbox "
+                    f"WHERE id IN ({placeholders}) AND attempts >= ?",
+                    (*ids, max_attempts),
+                ).fetchall()
+                self._conn.execute(
+                    "DELETE FROM outbox "
+                    f"WHERE id IN ({placeholders}) AND attempts >= ?",
+                    (*ids, max_attempts),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return dropped
+
+    def expire(self, channel) -> int:
+        """
+        Drop messages of a channel that were queued more than max_age ago
+
+        Args:
+            channel: Name of the channel
+
+        Returns:
+            Number of dropped messages
+        """
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM outbox WHERE channel = ? AND created_at < ?",
+                (channel, time.time() - self.max_age),
+            ).rowcount
+
+    def retain(self, channels) -> int:
+        """
+        Drop messages of all channels that are not in channels, e.g. those of
+        a notification URL or alerter that was removed from the config
+
+        Args:
+            channels: Names of the channels to keep
+
+        Returns:
+            Number of dropped messages
+        """
+        channels = list(channels)
+        placeholders = ",".join("?" * len(channels))
+        with self._lock:
+            return self._conn.execute(
+                f"DELETE FROM outbox WHERE channel NOT IN ({placeholders})",
+                channels,
+            ).rowcount
+
+    def pending(self, channel) -> int:
+        """Return the number of queued messages of a channel"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE channel = ?", (channel,)
+            ).fetchone()[0]
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
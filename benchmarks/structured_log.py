@@ -0,0 +1,100 @@
+"""
+Compare the split-based text parsing of GBFS collector logs with the
+structured (JSON-lines / logfmt) decoding. The text parser splits every line,
+structured decoding decodes each record that differs in more than its
+timestamp once, so its speed depends on how often records repeat. The
+"repetitive" logs only contain a few distinct records, the "varied" logs carry
+a duration, a vehicle count and a request path in every line, so almost no two
+lines are alike.
+
+Usage:
+    python -m benchmarks.structured_log [number_of_lines]
+"""
+
+import datetime
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from log_collector import GBFSLogCollector
+
+OPERATORS = ["Lime Stuttgart", "Dott Karlsruhe", "Voi", "Call a Bike"]
+FEEDS = ["free_bike_status", "vehicle_status", "station_information"]
+MESSAGES = ["Successfully scraped feed", "Skipping feed", "Fetching feed"]
+
+
+def _fields(i, varied):
+    operator = OPERATORS[i % len(OPERATORS)]
+    feed = FEEDS[i % len(FEEDS)]
+    msg = MESSAGES[i % len(MESSAGES)]
+    url = f"https://example.com/{feed}.json"
+    if not varied:
+        return operator, feed, msg, url, ""
+    duration = (i * 7919) % 5000
+    vehicles = (i * 31) % 2000
+    url = f"https://example.com/{operator.split()[0].lower()}/{i % 97}/{feed}.json"
+    return operator, feed, msg, url, (duration, vehicles)
+
+
+def _text_line(date, i, varied):
+    operator, feed, msg, url, extra = _fields(i, varied)
+    attrs = f'"feed":"{feed}","url":"{url}"'
+    if extra:
+        attrs += f',"duration_ms":{extra[0]},"vehicles":{extra[1]}'
+    return f"{date}T09:48:00.026899886Z INFO msg=[{operator}] {msg} attrs={{{attrs}}}\n"
+
+
+def _json_line(date, i, varied):
+    operator, feed, msg, url, extra = _fields(i, varied)
+    line = (
+        f'{{"time":"{date}T09:48:00.026899886Z","level":"INFO",'
+        f'"msg":"[{operator}] {msg}","feed":"{feed}","url":"{url}"'
+    )
+    if extra:
+        line += f',"duration_ms":{extra[0]},"vehicles":{extra[1]}'
+    return line + "}\n"
+
+
+def _logfmt_line(date, i, varied):
+    operator, feed, msg, url, extra = _fields(i, varied)
+    line = (
+        f'time={date}T09:48:00.026899886Z level=INFO msg="[{operator}] {msg}" '
+        f"feed={feed} url={url}"
+    )
+    if extra:
+        line += f" duration_ms={extra[0]} vehicles={extra[1]}"
+    return line + "\n"
+
+
+def _bench(label, line_factory, log_format, lines, varied, repeat=5):
+    date = (datetime.datetime.now() - datetime.timedelta(days=1)).strftime(
+        "%Y-%m-%d"
+    )
+    with tempfile.TemporaryDirectory() as log_dir:
+        with open(Path(log_dir) / f"{date}.txt", "w") as log_file:
+            log_file.writelines(line_factory(date, i, varied) for i in range(lines))
+
+        collector = GBFSLogCollector(
+            {"name": label, "log_file_path": log_dir, "log_format": log_format}
+        )
+        best = min(
+            timeit.repeat(collector._get_daily_metrics, number=1, repeat=repeat)
+        )
+    print(f"{label:<28} {best * 1000:8.1f} ms  ({lines / best:,.0f} lines/s)")
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Parsing {lines:,} lines, best of 5")
+    for varied in (False, True):
+        kind = "varied" if varied else "repetitive"
+        _bench(f"text (split), {kind}", _text_line, "text", lines, varied)
+        _bench(f"structured JSON, {kind}", _json_line, "structured", lines, varied)
+        _bench(
+            f"structured logfmt, {kind}", _logfmt_line, "structured", lines, varied
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import datetime
 
+from .log_tail import LogTail
+
 
 class GTFSLogCollector:
     def __init__(self, config):
@@ -14,15 +16,19 @@ class GTFSLogCollector:
                 "log_file_path must be provided in the config for GTFSLogCollector"
             )
 
-    def get_errors(self) -> list[str]:
-        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        # Remembers how far each consumer read the log in get_errors
+        self.error_tail = LogTail()
 
-        with open(self.log_file_path, "r") as log_file:
-            errors = []
-            for line in log_file:
-                if current_time in line and "ERROR" in line:
-                    errors.append(line.strip())
-        return errors
+    def get_errors(self, consumer=None) -> list[str]:
+        """
+        Return the ERROR lines logged since the previous call of consumer
+
+        Args:
+            consumer: Key of the caller, e.g. the alerter name, so several
+                alerters each receive every error
+        """
+        lines = self.error_tail.read_new_lines(self.log_file_path, consumer)
+        return [line.strip() for line in lines if "ERROR" in line]
 
     def generate_daily_message(self, site_name) -> str:
         """
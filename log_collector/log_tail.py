@@ -0,0 +1,59 @@
+import os
+import threading
+
+
+class LogTail:
+    """
+    Tracks read positions in a log file so every line is returned once to
+    each consumer
+    """
+
+    def __init__(self):
+        # Consumer -> [path, offset]
+        self.positions = {}
+        self._lock = threading.Lock()
+
+    def read_new_lines(self, path, consumer=None) -> list[str]:
+        """
+        Return the complete lines appended to path since the previous call of
+        the same consumer. The first call of a consumer only records the
+        current end of the file. When path changes (daily log rotation) the
+        rest of the previous file is read first, and the previous file is
+        followed until the new one exists.
+
+        Args:
+            path: Path of the log file to read
+            consumer: Key of the reader, every consumer has its own position
+
+        Returns:
+            List of new lines without line endings
+        """
+        with self._lock:
+            position = self.positions.get(consumer)
+            if position is None:
+                self.positions[consumer] = [path, os.path.getsize(path)]
+                return []
+
+            if path == position[0]:
+                return self._read(position)
+
+            lines = self._read(position) if os.path.exists(position[0]) else []
+            if not os.path.exists(path):
+                return lines
+            position[:] = [path, 0]
+            return lines + self._read(position)
+
+    def _read(self, position) -> list[str]:
+        path, offset = position
+        with open(path, "rb") as log_file:
+            log_file.seek(0, os.SEEK_END)
+            if log_file.tell() < offset:
+                # The file was truncated or replaced, start over
+                offset = 0
+            log_file.seek(offset)
+            data = log_file.read()
+
+        # Leave a partially written last line for the next call
+        end = data.rfind(b"\n") + 1
+        position[1] = offset + end
+        return data[:end].decode("utf-8", errors="replace").splitlines()
@@ -1,7 +1,18 @@
 import datetime
 
+from .log_tail import LogTail
+from .structured_log import (
+    LOG_FORMATS,
+    decode_structured_line,
+    iter_records,
+    operator_from_msg,
+)
+
 
 class NextbikeLogCollector:
+    # Keys read from structured log records
+    record_fields = ("level", "operator", "msg")
+
     def __init__(self, config):
         self.config = config
 
@@ -14,16 +25,28 @@ class NextbikeLogCollector:
                 "log_file_path must be provided in the config for NextbikeLogCollector"
             )
 
-    def get_errors(self) -> list[str]:
-        current_time = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M")
-        date = datetime.datetime.now().strftime("%Y-%m-%d")
+        # Remembers how far each consumer read the log in get_errors
+        self.error_tail = LogTail()
 
-        with open(self.log_file_path + "/" + date + ".txt", "r") as log_file:
-            errors = []
-            for line in log_file:
-                if current_time in line and "ERROR" in line:
-                    errors.append(line.strip())
-        return errors
+        self.log_format = config.get("log_format", "text")
+        if self.log_format not in LOG_FORMATS:
+            raise ValueError(
+                f"Unknown log_format for NextbikeLogCollector: {self.log_format}"
+            )
+
+    def get_errors(self, consumer=None) -> list[str]:
+        """
+        Return the ERROR lines logged since the previous call of consumer
+
+        Args:
+            consumer: Key of the caller, e.g. the alerter name, so several
+                alerters each receive every error
+        """
+        date = datetime.datetime.now().strftime("%Y-%m-%d")
+        lines = self.error_tail.read_new_lines(
+            self.log_file_path + "/" + date + ".txt", consumer
+        )
+        return [line.strip() for line in lines if "ERROR" in line]
 
     def generate_daily_message(self, site_name: str) -> str:
         """
@@ -85,40 +108,67 @@ class NextbikeLogCollector:
         )
         with open(self.log_file_path + "/" + date + ".txt", "r") as log_file:
             metrics = {}
-            for line in log_file:
-                if date in line:
-                    # 2025-10-31T10:15:00.11534971Z INFO msg=Starting scraping job
-                    # target=Germany url=https://maps.nextbike.net/maps/nextbike-live.json?countries=DE
-                    try:
-                        operator_name = line.split("[")[1].split("]")[0]
-                        # Skip non-operator lines
-                        if operator_name in [
-                            "Scraper",
-                            "Compactor",
-                            "Samba Move",
-                            "Scraping Cron",
-                        ]:
-                            continue
-                    except IndexError:
-                        continue
-                    if operator_name not in metrics:
-                        metrics[operator_name] = {}
-                    # fetching a feed case
-                    if "Starting scraping job" in line:
-                        metrics[operator_name]["Fetch"] = (
-                            metrics[operator_name].get("Fetch", 0) + 1
-                        )
-                    # Successfully saved scraped data path=/app/output-json/Germany/2025-10-31/1761905701.json
-                    elif "Successfully saved scraped data" in line:
-                        metrics[operator_name]["Save"] = (
-                            metrics[operator_name].get("Save", 0) + 1
-                        )
-                    elif "ERROR" in line:
-                        metrics[operator_name]["Error"] = (
-                            metrics[operator_name].get("Error", 0) + 1
-                        )
+            if self.log_format == "structured":
+                # Each distinct record is decoded once and weighted by count
+                records = iter_records(log_file, date)
+            else:
+                records = ((line, 1) for line in log_file if date in line)
+            for line, count in records:
+                # 2025-10-31T10:15:00.11534971Z INFO msg=Starting scraping job
+                # target=Germany url=https://maps.nextbike.net/maps/nextbike-live.json?countries=DE
+                parsed = self._parse_line(line)
+                if parsed is None:
+                    continue
+                operator_name, is_error, text = parsed
+                # Skip non-operator lines
+                if operator_name in [
+                    "Scraper",
+                    "Compactor",
+                    "Samba Move",
+                    "Scraping Cron",
+                ]:
+                    continue
+                if operator_name not in metrics:
+                    metrics[operator_name] = {}
+                # fetching a feed case
+                if "Starting scraping job" in text:
+                    metrics[operator_name]["Fetch"] = (
+                        metrics[operator_name].get("Fetch", 0) + count
+                    )
+                # Successfully saved scraped data path=/app/output-json/Germany/2025-10-31/1761905701.json
+                elif "Successfully saved scraped data" in text:
+                    metrics[operator_name]["Save"] = (
+                        metrics[operator_name].get("Save", 0) + count
+                    )
+                elif is_error:
+                    metrics[operator_name]["Error"] = (
+                        metrics[operator_name].get("Error", 0) + count
+                    )
 
         return metrics
 
+    def _parse_line(self, line):
+        """
+        Extract (operator, is_error, text) from a log line. Structured records
+        are decoded directly, any other line falls back to text parsing.
+        Returns None if the line does not name an operator.
+        """
+        if self.log_format == "structured":
+            record = decode_structured_line(line, self.record_fields)
+            if record is not None:
+                msg = record.get("msg", "")
+                operator_name = record.get("operator") or operator_from_msg(msg)
+                # Without an operator the record is parsed as text below
+                if operator_name:
+                    is_error = record.get("level", "").upper() == "ERROR"
+                    return operator_name, is_error, msg
+
+        # get the operator name between []
+        try:
+            operator_name = line.split("[")[1].split("]")[0]
+        except IndexError:
+            return None
+        return operator_name, "ERROR" in line, line
+
     def get_name(self):
         return self.name
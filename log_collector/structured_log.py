@@ -0,0 +1,141 @@
+import functools
+import json
+import re
+from collections import Counter
+
+import orjson
+
+
+LOG_FORMATS = ("text", "structured")
+
+# Keys read from structured records, everything else is ignored
+STRUCTURED_FIELDS = ("time", "level", "operator", "feed", "msg")
+
+# Replaces timestamps in the records yielded by iter_records
+TIMESTAMP_MARKER = "<timestamp>"
+
+# Common alternative spellings of the structured fields
+_FIELD_ALIASES = {
+    "time": ("ts", "timestamp"),
+    "level": ("lvl", "severity"),
+    "msg": ("message",),
+}
+
+_LOGFMT_START = re.compile(r"[A-Za-z_][\w.\-]*=")
+# Keys only start at the beginning of the line or after a space, anchoring on
+# that lets the regex skip over values instead of retrying inside them
+_LOGFMT_PAIR = re.compile(r'(?:^| )([^ ="]+)=("[^"\\]*(?:\\.[^"\\]*)*"?|[^ ]*)')
+
+
+@functools.lru_cache(maxsize=None)
+def _field_keys(fields) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """Return (field, accepted keys) pairs for the requested fields"""
+    return tuple((field, (field, *_FIELD_ALIASES.get(field, ()))) for field in fields)
+
+
+@functools.lru_cache(maxsize=None)
+def _key_fields(fields) -> dict[str, str]:
+    """Map every accepted key, including aliases, to its requested field"""
+    return {key: field for field, keys in _field_keys(fields) for key in keys}
+
+
+def decode_structured_line(line: str, fields=STRUCTURED_FIELDS) -> dict | None:
+    """
+    Decode a JSON-lines or logfmt record, keeping only the requested fields
+
+    Args:
+        line: Raw log line
+        fields: Field names to extract, as a tuple
+
+    Returns:
+        Dict of the extracted fields, or None if the line is not structured
+        and has to be parsed as text
+    """
+    line = line.rstrip()
+    if line.startswith("{"):
+        return _decode_json(line, fields)
+    if _LOGFMT_START.match(line):
+        return _decode_logfmt(line, fields)
+    return None
+
+
+def _decode_json(line: str, fields) -> dict | None:
+    try:
+        record = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(record, dict):
+        return None
+
+    # Look up only the requested keys instead of walking the whole record
+    result = {}
+    for field, keys in _field_keys(fields):
+        for key in keys:
+            value = record.get(key)
+            if value is not None:
+                result[field] = value if type(value) is str else str(value)
+                break
+    return result
+
+
+def _decode_logfmt(line: str, fields) -> dict | None:
+    key_fields = _key_fields(fields)
+    result = {}
+    for key, value in _LOGFMT_PAIR.findall(line):
+        field = key_fields.get(key)
+        if field is None or field in result:
+            continue
+        if value.startswith('"'):
+            value = _unquote(value)
+        result[field] = value
+    return result or None
+
+
+def _unquote(value: str) -> str:
+    if len(value) < 2 or not value.endswith('"'):
+        # Unterminated quote, keep the rest of the line
+        return value[1:]
+    if "\\" not in value:
+        return value[1:-1]
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value[1:-1]
+
+
+def iter_records(log_file, date: str, chunk_size=1 << 22):
+    """
+    Yield the distinct lines of a log file that contain date, with their
+    number of occurrences. Timestamps starting with date are replaced by a
+    marker first, so records that only differ in their time share a key and
+    each distinct record has to be decoded only once. The file is processed
+    in chunks of about chunk_size characters, which bounds memory use, and
+    the per-line work happens in re.sub and Counter rather than in Python.
+
+    Args:
+        log_file: Open text file
+        date: Date to match ("%Y-%m-%d")
+        chunk_size: Approximate number of characters read at once
+
+    Yields:
+        (record, count) tuples, the record with its timestamps replaced
+    """
+    timestamp = re.compile(re.escape(date) + r'[^ "]*')
+    while True:
+        lines = log_file.readlines(chunk_size)
+        if not lines:
+            return
+        chunk = timestamp.sub(TIMESTAMP_MARKER, "".join(lines))
+        for record, count in Counter(chunk.splitlines()).items():
+            if TIMESTAMP_MARKER in record:
+                yield record, count
+
+
+def operator_from_msg(msg: str) -> str | None:
+    """Return the operator name between [] at the start of a message, if any"""
+    if not msg.startswith("["):
+        return None
+    end = msg.find("]")
+    if end == -1:
+        return None
+    return msg[1:end]
@@ -1,15 +1,13 @@
 import yaml
 
-from alerter import Alerter
+from alerter import Alerter, NotificationOutbox
 from log_collector import (
     GBFSLogCollector,
     GTFSLogCollector,
     NextbikeLogCollector,
 )
 
-from utils import DataPipelineLogger
-import time
-import schedule
+from utils import DataPipelineLogger, Scheduler
 import apprise
 
 
@@ -33,6 +31,11 @@ class LogManager:
 
         self.site_name = alerting.get("site_name", "DefaultSite")
         self.daily_summary_time = alerting.get("daily_summary_time", "19:09")
+        self.error_check_interval = alerting.get("error_check_interval", 60)
+        self.daily_summary_deadline = alerting.get("daily_summary_deadline", 600)
+        self.outbox_flush_interval = alerting.get("outbox_flush_interval", 30)
+        self.outbox_max_attempts = alerting.get("outbox_max_attempts", 5)
+        self.message_max_length = alerting.get("message_max_length", 1900)
 
         # Setup logger as class attribute
         self.logger = DataPipelineLogger.get_logger(
@@ -47,6 +50,16 @@ class LogManager:
             "Nextbike": NextbikeLogCollector,
         }
 
+        self.scheduler = Scheduler(max_workers=alerting.get("scheduler_workers"))
+
+        # Shared by all alerters, every notification URL of an alerter has
+        # its own queue
+        self.outbox = NotificationOutbox(
+            alerting.get("outbox_path", "data/outbox.sqlite3"),
+            max_pending=alerting.get("outbox_max_pending", 10000),
+            max_age=alerting.get("outbox_max_age", 7 * 24 * 3600),
+        )
+
     def load_config(self) -> dict:
         """Load configuration from YAML file."""
         with open(self.config_path, "r") as file:
@@ -67,6 +80,7 @@ class LogManager:
             {
                 "name": log_collector_config.get("name", "UnnamedLogCollector"),
                 "log_file_path": log_collector_config.get("log_file", None),
+                "log_format": log_collector_config.get("log_format", "text"),
             }
         )
 
@@ -79,16 +93,41 @@ class LogManager:
             apprise_obj=apprise.Apprise(),
             log_collectors=log_collectors,
             site_name=self.site_name,
+            outbox=self.outbox,
+            max_body_length=self.message_max_length,
+            max_attempts=self.outbox_max_attempts,
         )
-        schedule.every().day.at(self.daily_summary_time).do(
-            self.alerter.send_daily_summary
+        self.scheduler.daily_at(
+            self.daily_summary_time,
+            self.alerter.send_daily_summary,
+            name=f"{alerter_name} daily summary",
+            deadline=self.daily_summary_deadline,
         )
         self.logger.info(
             f"Scheduled {alerter_name} Daily summary at {self.daily_summary_time}"
         )
 
-        schedule.every(1).minutes.do(self.alerter.check_errors)
-        self.logger.info(f"Scheduled {alerter_name} error check every minute")
+        self.scheduler.every(
+            self.error_check_interval,
+            self.alerter.check_errors,
+            name=f"{alerter_name} error check",
+            deadline=self.error_check_interval,
+        )
+        self.logger.info(
+            f"Scheduled {alerter_name} error check every {self.error_check_interval}s"
+        )
+
+        flush_job = self.scheduler.every(
+            self.outbox_flush_interval,
+            self.alerter.flush_outbox,
+            name=f"{alerter_name} outbox flush",
+        )
+        # Deliver new messages right away, including the initial message
+        self.alerter.on_enqueue = lambda: self.scheduler.trigger(flush_job)
+        self.scheduler.trigger(flush_job)
+        self.logger.info(
+            f"Scheduled {alerter_name} outbox flush every {self.outbox_flush_interval}s"
+        )
 
     def run(self):
         """Main method to process all configured operators and extensions."""
@@ -103,21 +142,24 @@ class LogManager:
             self.logger.error("No log collectors configured. Exiting.")
             return
 
+        channels = set()
         for alerter_item in self.alerting_config:
             for _, config in alerter_item.items():
                 self.logger.info(f"Creating alerter with config: {config}")
                 self.create_alerter(config, log_collectors)
-
-        while True:
-            try:
-                schedule.run_pending()
-                time.sleep(10)  # Check every 10 seconds
-            except KeyboardInterrupt:
-                self.logger.info("Shutting down LogManager.")
-                break
-            except Exception as e:
-                self.logger.error(f"Unexpected error in scheduler: {e}")
-                time.sleep(60)  # Wait a minute before retrying
+                channels.update(self.alerter.channels)
+
+        # Queues of URLs or alerters that are no longer configured are never
+        # flushed, drop them instead of keeping them forever
+        dropped = self.outbox.retain(channels)
+        if dropped:
+            self.logger.warning(
+                f"Dropped {dropped} queued message(s) of notification URLs that "
+                f"are no longer configured"
+            )
+
+        self.scheduler.run()
+        self.logger.info("Shutting down LogManager.")
 
 
 def main():
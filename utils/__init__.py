@@ -1,4 +1,5 @@
 # Extensions package
 from .data_pipeline_logger import DataPipelineLogger
+from .scheduler import ScheduledJob, Scheduler
 
-__all__ = ["DataPipelineLogger"]
+__all__ = ["DataPipelineLogger", "ScheduledJob", "Scheduler"]
@@ -0,0 +1,246 @@
+import asyncio
+import datetime
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .data_pipeline_logger import DataPipelineLogger
+
+
+class ScheduledJob:
+    """A single job registered with the Scheduler"""
+
+    def __init__(self, name, func, interval=None, at_time=None, deadline=None):
+        """
+        Initialize a scheduled job
+
+        Args:
+            name: Human-readable job name used in log messages
+            func: Blocking callable executed in the scheduler's executor
+            interval: Seconds between two runs (for interval jobs)
+            at_time: datetime.time of day to run at (for daily jobs)
+            deadline: Seconds after which a run is reported as overdue (optional)
+        """
+        if (interval is None) == (at_time is None):
+            raise ValueError("Exactly one of interval or at_time must be provided")
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be a positive number of seconds")
+
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.at_time = at_time
+        self.deadline = deadline
+        self.running = False
+        self.next_run = self._first_run(time.time())
+
+    def _first_run(self, now: float) -> float:
+        """Return the timestamp of the first run after now"""
+        if self.interval is not None:
+            return now + self.interval
+        return self._next_daily_run(now)
+
+    def _next_daily_run(self, now: float) -> float:
+        """Return the next timestamp at which at_time occurs after now"""
+        current = datetime.datetime.fromtimestamp(now)
+        candidate = datetime.datetime.combine(current.date(), self.at_time)
+        if candidate.timestamp() <= now:
+            candidate += datetime.timedelta(days=1)
+        return candidate.timestamp()
+
+    def reschedule(self, now: float):
+        """Advance next_run past now, skipping occurrences that were missed"""
+        if self.interval is not None:
+            # Keep the original cadence instead of drifting by the loop latency
+            missed = int((now - self.next_run) // self.interval) + 1
+            self.next_run += max(missed, 1) * self.interval
+        else:
+            self.next_run = self._next_daily_run(now)
+
+
+class Scheduler:
+    """Asyncio scheduler that dispatches blocking jobs from a timer heap"""
+
+    def __init__(self, max_workers=None):
+        """
+        Initialize the scheduler
+
+        Args:
+            max_workers: Number of threads available for blocking job work
+                (defaults to one per registered job)
+        """
+        self.logger = DataPipelineLogger(self.__class__.__name__)
+        self.max_workers = max_workers
+        self.jobs = []
+        self._heap = []
+        self._counter = itertools.count()
+        self._wakeup = None
+        self._executor = None
+        self._loop = None
+
+    def every(self, seconds, func, name=None, deadline=None) -> ScheduledJob:
+        """
+        Schedule func to run every given number of seconds
+
+        Args:
+            seconds: Interval between runs
+            func: Blocking callable to run
+            name: Job name (defaults to the callable's name)
+            deadline: Seconds after which a run is reported as overdue (optional)
+
+        Returns:
+            The registered ScheduledJob
+        """
+        job = ScheduledJob(
+            name or getattr(func, "__qualname__", repr(func)),
+            func,
+            interval=seconds,
+            deadline=deadline,
+        )
+        return self._add(job)
+
+    def daily_at(self, at, func, name=None, deadline=None) -> ScheduledJob:
+        """
+        Schedule func to run once a day at the given "HH:MM" or "HH:MM:SS" time
+
+        Args:
+            at: Local time of day as string
+            func: Blocking callable to run
+            name: Job name (defaults to the callable's name)
+            deadline: Seconds after which a run is reported as overdue (optional)
+
+        Returns:
+            The registered ScheduledJob
+        """
+        try:
+            at_time = datetime.time.fromisoformat(at)
+        except ValueError:
+            raise ValueError(f"Invalid time of day: {at}")
+
+        job = ScheduledJob(
+            name or getattr(func, "__qualname__", repr(func)),
+            func,
+            at_time=at_time,
+            deadline=deadline,
+        )
+        return self._add(job)
+
+    def _add(self, job: ScheduledJob) -> ScheduledJob:
+        self.jobs.append(job)
+        self._push(job)
+        return job
+
+    def _push(self, job: ScheduledJob, when=None):
+        # Entries with an explicit time are extra runs outside the job's cadence
+        periodic = when is None
+        heapq.heappush(
+            self._heap,
+            (job.next_run if periodic else when, next(self._counter), job, periodic),
+        )
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def trigger(self, job: ScheduledJob):
+        """
+        Run a registered job as soon as possible, in addition to its regular
+        runs. Safe to call from job threads. Ignored if the job is running.
+
+        Args:
+            job: Job returned by every or daily_at
+        """
+        if self._loop is None:
+            self._push(job, when=time.time())
+        else:
+            self._loop.call_soon_threadsafe(self._push, job, time.time())
+
+    def run(self):
+        """Run the scheduler until interrupted"""
+        try:
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            self.logger.info("Scheduler interrupted.")
+
+    async def _main(self):
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        # A job never overlaps with itself, so one thread per job guarantees
+        # that a job past its deadline cannot hold back the others
+        max_workers = self.max_workers or max(len(self.jobs), 1)
+        if max_workers < len(self.jobs):
+            self.logger.warning(
+                f"{len(self.jobs)} jobs share {max_workers} worker threads, "
+                f"slow jobs can delay the others"
+            )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="scheduler"
+        )
+        tasks = set()
+        try:
+            while True:
+                if not self._heap:
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    continue
+
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    # Sleep until the earliest job is due or a new job is added
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                _, _, job, periodic = heapq.heappop(self._heap)
+                now = time.time()
+                if job.running:
+                    if periodic:
+                        self.logger.warning(
+                            f"Skipping run of {job.name}: previous run still in progress"
+                        )
+                else:
+                    job.running = True
+                    task = asyncio.create_task(self._run_job(job))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if periodic:
+                    job.reschedule(now)
+                    self._push(job)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._loop = None
+
+    async def _run_job(self, job: ScheduledJob):
+        """Run a job in the executor, enforcing its deadline"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        future = loop.run_in_executor(self._executor, job.func)
+
+        def _finished(fut):
+            job.running = False
+            if fut.cancelled():
+                return
+            exc = fut.exception()
+            if exc is not None:
+                self.logger.error(f"Job {job.name} failed: {exc}")
+
+        # The worker thread cannot be interrupted, so the job stays marked as
+        # running until it actually returns, even after its deadline passed.
+        future.add_done_callback(_finished)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=job.deadline)
+        except asyncio.TimeoutError:
+            self.logger.error(
+                f"Job {job.name} exceeded its deadline of {job.deadline}s"
+            )
+        except Exception:
+            # Already reported by the done callback
+            pass
+        else:
+            elapsed = loop.time() - started
+            self.logger.debug(f"Job {job.name} finished in {elapsed:.2f}s")